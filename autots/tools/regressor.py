@@ -6,6 +6,37 @@ from autots.tools.seasonal import date_part
 from autots.tools.holiday import holiday_flag
 
 
+def _country_holiday_flags(train_index, fcst_index, frequency, holiday_country):
+    """Build the holiday flag columns of one country for train and forecast indexes."""
+    train_flags = pd.DataFrame(index=train_index)
+    fcst_flags = pd.DataFrame(index=fcst_index)
+    # create holiday flag for historic regressor
+    train_flags[f"holiday_flag_{holiday_country}"] = holiday_flag(
+        train_index, country=holiday_country
+    )
+    # now do again for future regressor
+    fcst_flags[f"holiday_flag_{holiday_country}"] = holiday_flag(
+        fcst_index, country=holiday_country
+    )
+    # now try it for future days
+    try:
+        holiday_future = holiday_flag(
+            train_index.shift(1, freq=frequency), country=holiday_country
+        )
+        holiday_future.index = train_index
+        holiday_future_2 = holiday_flag(
+            fcst_index.shift(1, freq=frequency), country=holiday_country
+        )
+        holiday_future_2.index = fcst_index
+        train_flags[f"holiday_flag_{holiday_country}_future"] = holiday_future
+        fcst_flags[f"holiday_flag_{holiday_country}_future"] = holiday_future_2
+    except Exception:
+        print(
+            f"holiday_future columns failed to add for {holiday_country}, likely due to complex datetime index"
+        )
+    return train_flags, fcst_flags
+
+
 def create_regressor(
     df,
     forecast_length,
@@ -96,31 +127,25 @@ def create_regressor(
         if isinstance(holiday_countries, str):
             holiday_countries = holiday_countries.split(",")
 
-        for holiday_country in holiday_countries:
-            # create holiday flag for historic regressor
-            regr_train[f"holiday_flag_{holiday_country}"] = holiday_flag(
-                regr_train.index, country=holiday_country
-            )
-            # now do again for future regressor
-            regr_fcst[f"holiday_flag_{holiday_country}"] = holiday_flag(
-                regr_fcst.index, country=holiday_country
-            )
-            # now try it for future days
-            try:
-                holiday_future = holiday_flag(
-                    regr_train.index.shift(1, freq=frequency), country=holiday_country
-                )
-                holiday_future.index = regr_train.index
-                holiday_future_2 = holiday_flag(
-                    regr_fcst.index.shift(1, freq=frequency), country=holiday_country
+        # the holidays package is pure Python, so with many countries build in parallel
+        if len(holiday_countries) > 2:
+            from joblib import Parallel, delayed
+
+            flag_frames = Parallel(n_jobs=len(holiday_countries))(
+                delayed(_country_holiday_flags)(
+                    regr_train.index, regr_fcst.index, frequency, holiday_country
                 )
-                holiday_future_2.index = regr_fcst.index
-                regr_train[f"holiday_flag_{holiday_country}_future"] = holiday_future
-                regr_fcst[f"holiday_flag_{holiday_country}_future"] = holiday_future_2
-            except Exception:
-                print(
-                    f"holiday_future columns failed to add for {holiday_country}, likely due to complex datetime index"
+                for holiday_country in holiday_countries
+            )
+        else:
+            flag_frames = [
+                _country_holiday_flags(
+                    regr_train.index, regr_fcst.index, frequency, holiday_country
                 )
+                for holiday_country in holiday_countries
+            ]
+        regr_train = pd.concat([regr_train] + [x[0] for x in flag_frames], axis=1)
+        regr_fcst = pd.concat([regr_fcst] + [x[1] for x in flag_frames], axis=1)
 
     # columns all as strings
     regr_train.columns = [str(xc) for xc in regr_train.columns]
